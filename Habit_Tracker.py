@@ -1,82 +1,237 @@
-import json
+import argparse
+import bisect
 import datetime
+import sys
+import time
+from array import array
 from collections import defaultdict
+from operator import attrgetter
+
+try:
+    import orjson as _json
+
+    _dumps = _json.dumps
+except ImportError:
+    import json as _json
+
+    def _dumps(obj):
+        return _json.dumps(obj).encode()
+
+_loads = _json.loads
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Binary habit files: this magic and format version, then one msgpack map.
+_BIN_MAGIC = b"HTRK\x01"
+
+# NumPy is never imported here: `import numpy` (~100 ms) costs more than the
+# plain loops take on any realistic history. It is only used when something
+# else already loaded it, and for inputs of at least this many items, where the
+# vectorized kernels measured faster than the loops (slower at ~100 items).
+_NUMPY_MIN_SIZE = 1_000
+
+
+def _loaded_numpy():
+    return sys.modules.get("numpy")
+
+_UNIX_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+def _parse_day_ordinals(dates):
+    # ISO date or datetime strings -> array of day ordinals.
+    ordinals = array("q")
+    if len(dates) >= _NUMPY_MIN_SIZE:
+        np = _loaded_numpy()
+        if np is not None:
+            # Parse the full strings in one call, then truncate to days.
+            days = np.array(dates, dtype="datetime64[us]").astype("datetime64[D]")
+            ordinals.frombytes((days.astype(np.int64) + _UNIX_EPOCH_ORDINAL).tobytes())
+            return ordinals
+    ordinals.extend(datetime.date.fromisoformat(date[:10]).toordinal() for date in dates)
+    return ordinals
+
+# Seed habits, reduced to day ordinals once at import rather than on every launch.
+_PREDEFINED_HABITS = tuple(
+    (name, periodicity, tuple(_parse_day_ordinals(dates)))
+    for name, periodicity, dates in [
+        ("Read 10 Pages", 1, ["2023-07-01", "2023-07-02", "2023-07-03", "2023-07-04", "2023-07-05", "2023-07-06", "2023-07-07"]),
+        ("Exercise", 1, ["2023-07-01", "2023-07-02", "2023-07-03", "2023-07-05", "2023-07-06", "2023-07-07"]),
+        ("Drink 2.5 Liters of Water", 1, ["2023-07-01", "2023-07-02", "2023-07-04", "2023-07-05", "2023-07-06"]),
+        ("Meditate for 10 Minutes", 1, ["2023-07-01", "2023-07-03", "2023-07-04", "2023-07-06"]),
+        ("Weekly Review", 7, ["2023-06-30"])
+    ]
+)
+
+def _streak_runs(ordinals, periodicity):
+    # Returns (longest run, trailing run) of checkoffs no more than
+    # periodicity days apart.
+    if len(ordinals) == 0:
+        return 0, 0
+
+    if len(ordinals) >= _NUMPY_MIN_SIZE:
+        np = _loaded_numpy()
+        if np is not None:
+            ordinals = np.asarray(ordinals, dtype=np.int64)
+            breaks = np.flatnonzero(np.diff(ordinals) > periodicity)
+            runs = np.diff(np.concatenate(([-1], breaks, [len(ordinals) - 1])))
+            return int(runs.max()), int(runs[-1])
+
+    longest = current_streak = 1
+    for i in range(1, len(ordinals)):
+        if ordinals[i] - ordinals[i - 1] <= periodicity:
+            current_streak += 1
+            if current_streak > longest:
+                longest = current_streak
+        else:
+            current_streak = 1
+
+    return longest, current_streak
 
 class Habit:
+    __slots__ = ("name", "periodicity", "created_at", "_checkoffs", "_iso", "_ord", "_ts_ns", "_last_ordinal", "streak", "longest")
+
+    # Habits compare and hash by identity; keep it that way so membership in
+    # tracker collections never falls back to field-by-field comparison.
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
     def __init__(self, name, periodicity, created_at=None):
         self.name = name
         self.periodicity = periodicity
         self.created_at = created_at if created_at else datetime.datetime.now()
-        self.checkoffs = []
+        self._checkoffs = []
+        self._iso = []
+        self._ord = array("q")
+        self._ts_ns = array("q")
+        self._last_ordinal = None
         self.streak = 0
-        self.last_checkoff_date = None
+        self.longest = 0
+
+    @property
+    def last_checkoff_date(self):
+        return datetime.date.fromordinal(self._last_ordinal) if self._last_ordinal is not None else None
+
+    @last_checkoff_date.setter
+    def last_checkoff_date(self, date):
+        self._last_ordinal = date.toordinal() if date is not None else None
+
+    @property
+    def checkoffs(self):
+        self._flush_timestamps()
+        if self._checkoffs is None:
+            self._checkoffs = [datetime.datetime.fromisoformat(dt) for dt in self._iso]
+        # A tuple, so changes have to go through the setter and reach _ord/_iso.
+        return tuple(self._checkoffs)
+
+    @checkoffs.setter
+    def checkoffs(self, checkoffs):
+        self._set_checkoffs(checkoffs)
+
+    def _flush_timestamps(self):
+        if self._iso is None:
+            # Seeded from bare day ordinals: midnights are formatted on first use.
+            seeded = self._ord[:len(self._ord) - len(self._ts_ns)]
+            self._iso = [datetime.datetime.fromordinal(ordinal).isoformat() for ordinal in seeded]
+        # New checkoffs are kept as raw time_ns() values until something needs
+        # them as datetimes or ISO strings.
+        for ns in self._ts_ns:
+            dt = datetime.datetime.fromtimestamp(ns // 10**9).replace(microsecond=ns // 1000 % 10**6)
+            if self._checkoffs is not None:
+                self._checkoffs.append(dt)
+            self._iso.append(dt.isoformat())
+        del self._ts_ns[:]
+
+    def _set_checkoffs(self, checkoffs):
+        self._checkoffs = sorted(checkoffs)
+        self._iso = [dt.isoformat() for dt in self._checkoffs]
+        self._set_ordinals(dt.toordinal() for dt in self._checkoffs)
+
+    def _set_ordinals(self, ordinals):
+        self._ord = array("q", ordinals)
+        self._ts_ns = array("q")
+        self._last_ordinal = self._ord[-1] if self._ord else None
+        self._rebuild_streaks()
 
     def checkoff(self):
-        today = datetime.date.today()
-        if self.last_checkoff_date:
-            delta = (today - self.last_checkoff_date).days
-            if delta > self.periodicity:
-                self.streak = 0
-        self.checkoffs.append(datetime.datetime.now())
-        self.last_checkoff_date = today
+        ns = time.time_ns()
+        seconds = ns // 10**9
+        today_ordinal = (seconds + time.localtime(seconds).tm_gmtoff) // 86400 + _UNIX_EPOCH_ORDINAL
+        if self._last_ordinal is not None and today_ordinal - self._last_ordinal > self.periodicity:
+            self.streak = 0
+        self._ts_ns.append(ns)
+        self._ord.append(today_ordinal)
+        self._last_ordinal = today_ordinal
         self.streak += 1
+        if self.streak > self.longest:
+            self.longest = self.streak
 
-    def current_streak(self):
-        today = datetime.date.today()
-        if self.last_checkoff_date:
-            delta = (today - self.last_checkoff_date).days
-            if delta <= self.periodicity:
-                return self.streak
+    def current_streak(self, today=None):
+        today = today or datetime.date.today()
+        if self._last_ordinal is not None and today.toordinal() - self._last_ordinal <= self.periodicity:
+            return self.streak
         return 0
 
     def longest_streak(self):
-        if not self.checkoffs:
-            return 0
-
-        streaks = []
-        current_streak = 1
+        return self.longest
 
-        for i in range(1, len(self.checkoffs)):
-            if (self.checkoffs[i].date() - self.checkoffs[i - 1].date()).days <= self.periodicity:
-                current_streak += 1
-            else:
-                streaks.append(current_streak)
-                current_streak = 1
-
-        streaks.append(current_streak)
-        return max(streaks)
+    def _rebuild_streaks(self):
+        self.longest, self.streak = _streak_runs(self._ord, self.periodicity)
 
     def to_dict(self):
+        self._flush_timestamps()
         return {
             "name": self.name,
             "periodicity": self.periodicity,
             "created_at": self.created_at.isoformat(),
-            "checkoffs": [dt.isoformat() for dt in self.checkoffs]
+            "checkoffs": list(self._iso)
         }
 
     @classmethod
     def from_dict(cls, data):
         habit = cls(data["name"], data["periodicity"], datetime.datetime.fromisoformat(data["created_at"]))
-        habit.checkoffs = [datetime.datetime.fromisoformat(dt) for dt in data["checkoffs"]]
-        if habit.checkoffs:
-            habit.last_checkoff_date = habit.checkoffs[-1].date()
+        # Only the day is needed for streaks; full datetimes are parsed on first access.
+        habit._checkoffs = None
+        habit._iso = sorted(data["checkoffs"])
+        habit._set_ordinals(_parse_day_ordinals(habit._iso))
+        return habit
+
+    @classmethod
+    def _from_binary(cls, name, data):
+        habit = cls(name, data["p"], datetime.datetime.fromisoformat(data["ca"]))
+        habit._checkoffs = None
+        habit._iso = sorted(data["i"])
+        habit._set_ordinals(sorted(data["c"]))
+        return habit
+
+    @classmethod
+    def from_ordinals(cls, name, periodicity, ordinals):
+        habit = cls(name, periodicity)
+        habit._checkoffs = None
+        habit._iso = None
+        habit._set_ordinals(sorted(ordinals))
         return habit
 
 
 class HabitTracker:
     def __init__(self):
         self.habits = {}
-        self.habits_by_periodicity = defaultdict(list)
+        self.habits_by_periodicity = defaultdict(dict)
 
     def add_habit(self, name, periodicity):
-        habit = Habit(name, periodicity)
-        self.habits[name] = habit
-        self.habits_by_periodicity[periodicity].append(habit)
+        self._insert_habit(Habit(name, periodicity))
+
+    def _insert_habit(self, habit):
+        self.delete_habit(habit.name)
+        self.habits[habit.name] = habit
+        self.habits_by_periodicity[habit.periodicity][habit.name] = habit
 
     def delete_habit(self, name):
         if name in self.habits:
             habit = self.habits.pop(name)
-            self.habits_by_periodicity[habit.periodicity].remove(habit)
+            del self.habits_by_periodicity[habit.periodicity][name]
 
     def checkoff_habit(self, name):
         if name in self.habits:
@@ -88,66 +243,110 @@ class HabitTracker:
         return list(self.habits.values())
 
     def get_habits_by_periodicity(self, periodicity):
-        return self.habits_by_periodicity[periodicity]
+        return list(self.habits_by_periodicity[periodicity].values())
 
     def longest_streak_all(self):
-        return max((habit.longest_streak() for habit in self.habits.values()), default=0)
+        return max(map(attrgetter("longest"), self.habits.values()), default=0)
 
     def longest_streak_for_habit(self, name):
         if name in self.habits:
             return self.habits[name].longest_streak()
         return 0
 
-    def habits_struggled_last_month(self):
-        one_month_ago = datetime.date.today() - datetime.timedelta(days=30)
+    def habits_struggled_last_month(self, today=None):
+        today = today or datetime.date.today()
+        cutoff = (today - datetime.timedelta(days=30)).toordinal()
         struggled_habits = []
         for habit in self.habits.values():
-            if not habit.checkoffs or habit.checkoffs[-1].date() < one_month_ago:
+            if not habit._ord or habit._ord[-1] < cutoff:
                 struggled_habits.append(habit.name)
         return struggled_habits
 
+    def struggle_report(self, days=30, today=None):
+        # Relies on _ord being sorted: every loader sorts its input and
+        # checkoff() only ever appends today's day.
+        today = today or datetime.date.today()
+        cutoff = (today - datetime.timedelta(days=days)).toordinal()
+        return {name: len(habit._ord) - bisect.bisect_left(habit._ord, cutoff) for name, habit in self.habits.items()}
+
     def save_to_file(self, filename="habits.json"):
-        with open(filename, "w") as f:
-            json.dump({name: habit.to_dict() for name, habit in self.habits.items()}, f)
+        # Stream one habit at a time so only a single habit's dict is held in memory.
+        with open(filename, "wb") as f:
+            f.write(b"{")
+            for i, (name, habit) in enumerate(self.habits.items()):
+                if i:
+                    f.write(b",")
+                f.write(_dumps(name) + b":" + _dumps(habit.to_dict()))
+            f.write(b"}")
 
     def load_from_file(self, filename="habits.json"):
         try:
-            with open(filename, "r") as f:
-                data = json.load(f)
-                self.habits = {name: Habit.from_dict(h) for name, h in data.items()}
-                self.habits_by_periodicity = defaultdict(list)
-                for habit in self.habits.values():
-                    self.habits_by_periodicity[habit.periodicity].append(habit)
+            with open(filename, "rb") as f:
+                data = _loads(f.read())
+                self._set_habits({name: Habit.from_dict(h) for name, h in data.items()})
         except FileNotFoundError:
             pass
 
+    def save_to_file_bin(self, filename="habits.bin"):
+        # Stores day ordinals next to the ISO strings, so loading needs no
+        # date parsing and no time of day is lost.
+        _require_msgpack()
+        packer = msgpack.Packer()
+        with open(filename, "wb") as f:
+            f.write(_BIN_MAGIC)
+            f.write(packer.pack_map_header(len(self.habits)))
+            for name, habit in self.habits.items():
+                habit._flush_timestamps()
+                f.write(packer.pack(name))
+                f.write(packer.pack({
+                    "p": habit.periodicity,
+                    "ca": habit.created_at.isoformat(),
+                    "c": habit._ord.tolist(),
+                    "i": habit._iso
+                }))
+
+    def load_from_file_bin(self, filename="habits.bin"):
+        _require_msgpack()
+        try:
+            with open(filename, "rb") as f:
+                content = f.read()
+        except FileNotFoundError:
+            return
+        if not content.startswith(_BIN_MAGIC):
+            raise ValueError(f"{filename} is not a binary habits file")
+        data = msgpack.unpackb(content[len(_BIN_MAGIC):])
+        self._set_habits({name: Habit._from_binary(name, h) for name, h in data.items()})
+
+    def _set_habits(self, habits):
+        self.habits = {}
+        self.habits_by_periodicity = defaultdict(dict)
+        for habit in habits.values():
+            self._insert_habit(habit)
+
+
+def _require_msgpack():
+    if msgpack is None:
+        raise ImportError("The binary habits format requires the msgpack package.")
+
 
 def get_user_input(prompt, valid_responses):
+    valid = frozenset(valid_responses)
+    error_message = f"Please enter one of the following: {', '.join(valid_responses)}"
     while True:
         response = input(prompt).strip().lower()
-        if response in valid_responses:
+        if response in valid:
             return response
-        print(f"Please enter one of the following: {', '.join(valid_responses)}")
+        print(error_message)
 
-def cli():
+def cli(binary=False):
     habit_tracker = HabitTracker()
-    habit_tracker.load_from_file()
-
-    predefined_habits = [
-        {"name": "Read 10 Pages", "periodicity": 1, "checkoffs": ["2023-07-01", "2023-07-02", "2023-07-03", "2023-07-04", "2023-07-05", "2023-07-06", "2023-07-07"]},
-        {"name": "Exercise", "periodicity": 1, "checkoffs": ["2023-07-01", "2023-07-02", "2023-07-03", "2023-07-05", "2023-07-06", "2023-07-07"]},
-        {"name": "Drink 2.5 Liters of Water", "periodicity": 1, "checkoffs": ["2023-07-01", "2023-07-02", "2023-07-04", "2023-07-05", "2023-07-06"]},
-        {"name": "Meditate for 10 Minutes", "periodicity": 1, "checkoffs": ["2023-07-01", "2023-07-03", "2023-07-04", "2023-07-06"]},
-        {"name": "Weekly Review", "periodicity": 7, "checkoffs": ["2023-06-30"]}
-    ]
+    if binary:
+        habit_tracker.load_from_file_bin()
+    else:
+        habit_tracker.load_from_file()
 
-    for habit_data in predefined_habits:
-        habit = Habit(habit_data["name"], habit_data["periodicity"])
-        habit.checkoffs = [datetime.datetime.strptime(date, "%Y-%m-%d") for date in habit_data["checkoffs"]]
-        if habit.checkoffs:
-            habit.last_checkoff_date = habit.checkoffs[-1].date()
-        habit_tracker.habits[habit.name] = habit
-        habit_tracker.habits_by_periodicity[habit.periodicity].append(habit)
+    for name, periodicity, ordinals in _PREDEFINED_HABITS:
+        habit_tracker._insert_habit(Habit.from_ordinals(name, periodicity, ordinals))
 
     user_name = input("What's your name? ").strip()
     print(f"Hello {user_name}, another brick on the wall, let's see how much we got closer to our aims.")
@@ -230,15 +429,21 @@ def cli():
 
         elif choice == "7":
             print("Analyzing habits:")
+            today = datetime.date.today()
             longest_streak = habit_tracker.longest_streak_all()
             current_daily_habits = [habit.name for habit in habit_tracker.get_habits_by_periodicity(1)]
-            struggled_habits = habit_tracker.habits_struggled_last_month()
+            struggled_habits = habit_tracker.habits_struggled_last_month(today)
+            recent_checkoffs = [f"{name} ({count})" for name, count in habit_tracker.struggle_report(today=today).items()]
             print(f"Longest streak: {longest_streak} days")
             print("Current daily habits:", ", ".join(current_daily_habits))
             print("Habits struggled most last month:", ", ".join(struggled_habits))
+            print("Checkoffs in the last 30 days:", ", ".join(recent_checkoffs))
 
         elif choice == "8":
-            habit_tracker.save_to_file()
+            if binary:
+                habit_tracker.save_to_file_bin()
+            else:
+                habit_tracker.save_to_file()
             print("Habits saved. Goodbye!")
             break
 
@@ -246,7 +451,12 @@ def cli():
             print("Invalid option. Please try again.")
 
 def run():
-    cli()
+    parser = argparse.ArgumentParser(description="Habit Tracker")
+    parser.add_argument("--binary", action="store_true", help="load and save habits.bin (msgpack) instead of habits.json")
+    args = parser.parse_args()
+    if args.binary and msgpack is None:
+        parser.error("--binary requires the msgpack package")
+    cli(binary=args.binary)
 
 if __name__ == "__main__":
     run()
\ No newline at end of file
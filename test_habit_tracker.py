@@ -0,0 +1,208 @@
+import datetime
+import os
+import tempfile
+import unittest
+from array import array
+from unittest import mock
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+import Habit_Tracker
+from Habit_Tracker import Habit, HabitTracker, _parse_day_ordinals, _streak_runs
+
+
+def _habit(periodicity, days, name="habit"):
+    return Habit.from_ordinals(name, periodicity, [datetime.date(2023, 7, day).toordinal() for day in days])
+
+
+class StreakRunsTest(unittest.TestCase):
+    CASES = [
+        ([], 1, (0, 0)),
+        ([10], 1, (1, 1)),
+        ([1, 2, 3, 5, 6, 7, 8, 20], 1, (4, 1)),
+        ([1, 1, 9, 10], 1, (2, 2)),
+        ([1, 8, 20], 7, (2, 1)),
+    ]
+
+    def check_cases(self):
+        for ordinals, periodicity, expected in self.CASES:
+            self.assertEqual(_streak_runs(array("q", ordinals), periodicity), expected)
+
+    def test_loop(self):
+        with mock.patch.object(Habit_Tracker, "_loaded_numpy", return_value=None):
+            with mock.patch.object(Habit_Tracker, "_NUMPY_MIN_SIZE", 0):
+                self.check_cases()
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_numpy(self):
+        with mock.patch.object(Habit_Tracker, "_NUMPY_MIN_SIZE", 1):
+            self.check_cases()
+
+
+class ParseDayOrdinalsTest(unittest.TestCase):
+    DATES = ["2023-06-30", "2023-07-01T00:00:00", "2024-02-29T23:59:59.999999"]
+    EXPECTED = array("q", [datetime.date(2023, 6, 30).toordinal(), datetime.date(2023, 7, 1).toordinal(), datetime.date(2024, 2, 29).toordinal()])
+
+    def test_stdlib(self):
+        with mock.patch.object(Habit_Tracker, "_loaded_numpy", return_value=None):
+            with mock.patch.object(Habit_Tracker, "_NUMPY_MIN_SIZE", 0):
+                self.assertEqual(_parse_day_ordinals(self.DATES), self.EXPECTED)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_numpy(self):
+        with mock.patch.object(Habit_Tracker, "_NUMPY_MIN_SIZE", 1):
+            self.assertEqual(_parse_day_ordinals(self.DATES), self.EXPECTED)
+
+
+class HabitTest(unittest.TestCase):
+    def test_to_dict_does_not_share_checkoff_state(self):
+        habit = _habit(1, [1, 2])
+        habit.to_dict()["checkoffs"].clear()
+        self.assertEqual(len(habit.checkoffs), 2)
+        self.assertEqual(len(habit.to_dict()["checkoffs"]), 2)
+
+    def test_checkoffs_changes_go_through_the_setter(self):
+        habit = _habit(1, [1, 2])
+        with self.assertRaises(AttributeError):
+            habit.checkoffs.append(datetime.datetime(2023, 7, 3))
+        habit.checkoffs = habit.checkoffs + (datetime.datetime(2023, 7, 3, 8, 0),)
+        self.assertEqual(len(habit.to_dict()["checkoffs"]), 3)
+        self.assertEqual((habit.longest, habit.last_checkoff_date), (3, datetime.date(2023, 7, 3)))
+
+    def test_last_checkoff_date_is_assignable(self):
+        habit = _habit(1, [1, 2])
+        self.assertEqual(habit.last_checkoff_date, datetime.date(2023, 7, 2))
+        habit.last_checkoff_date = datetime.date(2023, 7, 10)
+        self.assertEqual(habit.last_checkoff_date, datetime.date(2023, 7, 10))
+        self.assertEqual(habit.current_streak(datetime.date(2023, 7, 11)), 2)
+        habit.last_checkoff_date = None
+        self.assertIsNone(habit.last_checkoff_date)
+        self.assertEqual(habit.current_streak(datetime.date(2023, 7, 2)), 0)
+
+    def test_seeded_checkoffs_are_formatted_lazily(self):
+        habit = _habit(1, [1, 2])
+        self.assertIsNone(habit._iso)
+        habit.checkoff()
+        checkoffs = habit.to_dict()["checkoffs"]
+        self.assertEqual(checkoffs[:2], ["2023-07-01T00:00:00", "2023-07-02T00:00:00"])
+        self.assertEqual(len(checkoffs), 3)
+        self.assertEqual(habit.checkoffs[0], datetime.datetime(2023, 7, 1))
+
+    def test_current_streak_uses_given_today(self):
+        habit = _habit(1, [1, 2, 3])
+        self.assertEqual(habit.current_streak(datetime.date(2023, 7, 4)), 3)
+        self.assertEqual(habit.current_streak(datetime.date(2023, 7, 5)), 0)
+
+
+class HabitTrackerTest(unittest.TestCase):
+    def test_longest_streak_all_sees_direct_habit_checkoffs(self):
+        tracker = HabitTracker()
+        tracker.add_habit("a", 1)
+        self.assertEqual(tracker.longest_streak_all(), 0)
+        tracker.habits["a"].checkoff()
+        self.assertEqual(tracker.longest_streak_all(), 1)
+
+    def test_delete_habit_updates_periodicity_buckets(self):
+        tracker = HabitTracker()
+        tracker.add_habit("a", 1)
+        tracker.add_habit("b", 1)
+        tracker.delete_habit("a")
+        tracker.delete_habit("missing")
+        self.assertEqual([habit.name for habit in tracker.get_habits_by_periodicity(1)], ["b"])
+        self.assertEqual(list(tracker.habits), ["b"])
+
+        tracker.add_habit("a", 1)
+        self.assertEqual([habit.name for habit in tracker.get_habits_by_periodicity(1)], ["b", "a"])
+        tracker.delete_habit("a")
+        self.assertEqual([habit.name for habit in tracker.get_habits_by_periodicity(1)], ["b"])
+
+    def test_re_adding_a_habit_replaces_it_in_its_bucket(self):
+        tracker = HabitTracker()
+        tracker.add_habit("a", 1)
+        first = tracker.habits["a"]
+        tracker.add_habit("a", 1)
+        self.assertEqual(tracker.get_habits_by_periodicity(1), [tracker.habits["a"]])
+        self.assertIsNot(tracker.habits["a"], first)
+
+        tracker.add_habit("a", 7)
+        self.assertEqual(tracker.get_habits_by_periodicity(1), [])
+        self.assertEqual(tracker.get_habits_by_periodicity(7), [tracker.habits["a"]])
+
+    def test_habits_struggled_last_month_uses_given_today(self):
+        tracker = HabitTracker()
+        tracker._insert_habit(_habit(1, [1], name="a"))
+        tracker._insert_habit(_habit(1, [20], name="b"))
+        self.assertEqual(tracker.habits_struggled_last_month(datetime.date(2023, 8, 15)), ["a"])
+
+    def test_struggle_report_counts_window_for_unsorted_input(self):
+        tracker = HabitTracker()
+        tracker._insert_habit(Habit.from_dict({
+            "name": "a",
+            "periodicity": 1,
+            "created_at": "2023-06-01T00:00:00",
+            "checkoffs": ["2023-07-20T08:00:00", "2023-05-01T08:00:00", "2023-07-10T08:00:00"]
+        }))
+        tracker._insert_habit(_habit(1, [3, 1, 2], name="b"))
+        self.assertEqual(tracker.struggle_report(today=datetime.date(2023, 7, 25)), {"a": 2, "b": 3})
+        self.assertEqual(tracker.struggle_report(days=10, today=datetime.date(2023, 7, 25)), {"a": 1, "b": 0})
+        self.assertEqual(tracker.habits["a"].last_checkoff_date, datetime.date(2023, 7, 20))
+
+
+class FileRoundTripTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.tracker = HabitTracker()
+        self.tracker._insert_habit(Habit.from_dict({
+            "name": "a",
+            "periodicity": 1,
+            "created_at": "2023-06-01T09:30:00",
+            "checkoffs": ["2023-07-01T07:15:00.250000", "2023-07-02T21:00:00"]
+        }))
+        self.tracker._insert_habit(_habit(7, [1, 8], name="b"))
+        self.tracker.add_habit("c", 1)
+        self.tracker.checkoff_habit("c")
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def snapshot(self, tracker):
+        return {name: (habit.to_dict(), habit.streak, habit.longest) for name, habit in tracker.habits.items()}
+
+    def test_json(self):
+        self.tracker.save_to_file(self.path("habits.json"))
+        loaded = HabitTracker()
+        loaded.load_from_file(self.path("habits.json"))
+        self.assertEqual(self.snapshot(loaded), self.snapshot(self.tracker))
+
+    @unittest.skipIf(Habit_Tracker.msgpack is None, "msgpack is not installed")
+    def test_binary_keeps_time_of_day(self):
+        self.tracker.save_to_file_bin(self.path("habits.bin"))
+        loaded = HabitTracker()
+        loaded.load_from_file_bin(self.path("habits.bin"))
+        self.assertEqual(self.snapshot(loaded), self.snapshot(self.tracker))
+        self.assertEqual(loaded.habits["a"].checkoffs[0], datetime.datetime(2023, 7, 1, 7, 15, 0, 250000))
+        self.assertEqual(loaded.get_habits_by_periodicity(7), [loaded.habits["b"]])
+
+        loaded.save_to_file(self.path("habits.json"))
+        reloaded = HabitTracker()
+        reloaded.load_from_file(self.path("habits.json"))
+        self.assertEqual(self.snapshot(reloaded), self.snapshot(self.tracker))
+
+    @unittest.skipIf(Habit_Tracker.msgpack is None, "msgpack is not installed")
+    def test_binary_rejects_other_files(self):
+        self.tracker.save_to_file(self.path("habits.json"))
+        with self.assertRaises(ValueError):
+            HabitTracker().load_from_file_bin(self.path("habits.json"))
+
+    def test_binary_without_msgpack(self):
+        with mock.patch.object(Habit_Tracker, "msgpack", None):
+            with self.assertRaises(ImportError):
+                self.tracker.save_to_file_bin(self.path("habits.bin"))
+
+
+if __name__ == "__main__":
+    unittest.main()